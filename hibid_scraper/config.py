@@ -4,16 +4,27 @@ Configuration management for HiBid Scraper.
 Loads settings from environment variables or .env file.
 """
 
+import functools
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load .env file if present
-load_dotenv()
+_DOTENV_LOADED = False
 
 
-@dataclass
+def load_env() -> None:
+    """Load the .env file if present (only once per process)."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+load_env()
+
+
+@dataclass(slots=True, frozen=True)
 class Config:
     """Scraper configuration settings."""
 
@@ -22,7 +33,7 @@ class Config:
 
     # Search parameters
     radius_miles: int = 50
-    search_categories: list[str] = None
+    search_categories: list[str] = field(default_factory=list)
 
     # Mode settings
     test_mode: bool = False
@@ -30,22 +41,29 @@ class Config:
 
     # Database
     database_url: str = "sqlite:///hibid_auctions.db"
+    compress_payloads: bool = False
 
     # Rate limiting
     request_delay_min: int = 2
     request_delay_max: int = 5
+    concurrency: int = 1
 
     # Logging
     log_level: str = "INFO"
 
-    def __post_init__(self):
-        if self.search_categories is None:
-            self.search_categories = []
-
     @classmethod
     def from_env(cls) -> "Config":
-        """Load configuration from environment variables."""
+        """
+        Load configuration from environment variables.
 
+        The environment is read once per process; later calls return the
+        same instance.
+        """
+        return _config_from_env(cls)
+
+    @classmethod
+    def _read_env(cls) -> "Config":
+        """Build a Config from the current environment variables."""
         zip_code = os.getenv("ZIP_CODE")
         if not zip_code:
             raise ValueError("ZIP_CODE environment variable is required")
@@ -61,8 +79,10 @@ class Config:
             test_mode=os.getenv("TEST_MODE", "false").lower() == "true",
             test_limit=int(os.getenv("TEST_LIMIT", "20")),
             database_url=os.getenv("DATABASE_URL", "sqlite:///hibid_auctions.db"),
+            compress_payloads=os.getenv("COMPRESS_PAYLOADS", "false").lower() == "true",
             request_delay_min=int(os.getenv("REQUEST_DELAY_MIN", "2")),
             request_delay_max=int(os.getenv("REQUEST_DELAY_MAX", "5")),
+            concurrency=int(os.getenv("CONCURRENCY", "1")),
             log_level=os.getenv("LOG_LEVEL", "INFO"),
         )
 
@@ -80,3 +100,8 @@ class Config:
             # Format: sqlite:///path/to/db.db
             return self.database_url.replace("sqlite:///", "")
         return None
+
+
+@functools.lru_cache(maxsize=1)
+def _config_from_env(cls: type[Config]) -> Config:
+    return cls._read_env()
@@ -4,16 +4,177 @@ Database management for HiBid Scraper.
 Stores raw JSON payloads in SQLite (PostgreSQL-compatible schema).
 """
 
-import json
+import hashlib
 import logging
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Optional, Any
+from typing import Iterator, Optional, Any, Union
+
+import orjson
 
 from config import Config
 
+try:
+    import zstandard
+except ImportError:  # Optional: uv sync --extra compression
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# zstd payload compression settings
+ZSTD_LEVEL = 3
+ZSTD_DICT_SIZE = 112_640  # zstd's default dictionary size (110 KB)
+ZSTD_DICT_SAMPLES = 1000  # Uncompressed payloads needed to train a dictionary
+
+# Rows read per step when a migration rewrites every item
+MIGRATION_CHUNK_SIZE = 1000
+
+
+def content_hash(payload: bytes) -> bytes:
+    """Return a 16-byte BLAKE2b digest of a serialized payload."""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+# Statements executed on every scrape run, defined once at module level so
+# every caller shares a single copy that can't drift out of sync.
+_SQL_START_RUN = """
+    INSERT INTO scrape_runs (started_at, zip_code, radius_miles, test_mode)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_COMPLETE_RUN = """
+    UPDATE scrape_runs
+    SET completed_at = ?, items_found = ?, items_added = ?,
+        items_updated = ?, errors = ?, status = ?
+    WHERE id = ?
+"""
+
+_SQL_MAX_ITEM_ID = "SELECT COALESCE(MAX(id), 0) FROM auction_items"
+
+# Stored hashes for a batch of item ids, passed as one JSON array parameter.
+# The planner prefers the UNIQUE(item_id) autoindex, which needs a table
+# lookup reading past raw_json's overflow pages; INDEXED BY keeps the probe
+# on the covering index.
+_SQL_SELECT_HASHES = """
+    SELECT item_id, content_hash FROM auction_items INDEXED BY idx_item_hash
+    WHERE item_id IN (SELECT value FROM json_each(?))
+"""
+
+_SQL_UPSERT_ITEM = """
+    INSERT INTO auction_items
+    (item_id, raw_json, content_hash, scraped_at, zip_code,
+     radius_miles, category)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(item_id) DO UPDATE SET
+        raw_json = excluded.raw_json,
+        content_hash = excluded.content_hash,
+        scraped_at = excluded.scraped_at,
+        zip_code = excluded.zip_code,
+        radius_miles = excluded.radius_miles,
+        category = excluded.category
+    WHERE auction_items.content_hash IS NOT excluded.content_hash
+    RETURNING id
+"""
+
+_SQL_INSERT_SEARCH = """
+    INSERT INTO auction_items_fts (rowid, item_id, lead, description)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_DELETE_SEARCH = "DELETE FROM auction_items_fts WHERE rowid = ?"
+
+_SQL_SELECT_ITEM = """
+    SELECT item_id, raw_json, scraped_at, zip_code, radius_miles, category, created_at
+    FROM auction_items
+    WHERE item_id = ?
+"""
+
+
+def search_fields(raw_json: dict) -> tuple[Optional[str], Optional[str]]:
+    """
+    Return the (lead, description) text indexed for full-text search.
+
+    Values that aren't strings (e.g. nested objects) are not indexed.
+    """
+    lead = raw_json.get("lead")
+    description = raw_json.get("description")
+    return (
+        lead if isinstance(lead, str) else None,
+        description if isinstance(description, str) else None,
+    )
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError(
+            "zstandard is required for compressed payloads: uv sync --extra compression"
+        )
+
+
+class PayloadCodec:
+    """
+    Encodes raw_json payloads for storage and decodes them for reading.
+
+    Payloads are stored as plain JSON TEXT until a zstd dictionary has been
+    trained, then as compressed BLOBs. Rows are self-describing by type, so
+    both forms can coexist in the same table.
+    """
+
+    def __init__(self, dict_data: Optional[bytes] = None, compress: bool = False):
+        self._compressor = None
+        self._decompressor = None
+
+        if dict_data is not None:
+            _require_zstandard()
+            zstd_dict = zstandard.ZstdCompressionDict(dict_data)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=zstd_dict)
+            if compress:
+                self._compressor = zstandard.ZstdCompressor(
+                    level=ZSTD_LEVEL, dict_data=zstd_dict
+                )
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection, compress: bool = False) -> "PayloadCodec":
+        """Build a codec using the dictionary stored in the meta table, if any."""
+        try:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'zstd_dict'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Databases created before the meta table existed
+            row = None
+        return cls(row[0] if row else None, compress=compress)
+
+    @property
+    def compresses(self) -> bool:
+        """Whether new payloads are stored compressed."""
+        return self._compressor is not None
+
+    def encode(self, payload: bytes) -> Union[str, bytes]:
+        """Return the value to store in the raw_json column for serialized JSON."""
+        if self._compressor is None:
+            return payload.decode()
+        return self._compressor.compress(payload)
+
+    def decode_text(self, value: Union[str, bytes]) -> str:
+        """Return a stored raw_json value as JSON text."""
+        if isinstance(value, bytes):
+            if self._decompressor is None:
+                raise RuntimeError("Compressed payload found but no zstd dictionary is stored")
+            return self._decompressor.decompress(value).decode()
+        return value
+
+    def decode(self, value: Union[str, bytes]) -> Any:
+        """Parse a stored raw_json value back into a Python object."""
+        if isinstance(value, bytes):
+            if self._decompressor is None:
+                raise RuntimeError("Compressed payload found but no zstd dictionary is stored")
+            value = self._decompressor.decompress(value)
+        return orjson.loads(value)
+
 
 # =============================================================================
 # DATABASE BACKEND SWAP INSTRUCTIONS
@@ -43,13 +204,55 @@ class Database:
         self.config = config
         self.db_path = config.get_sqlite_path()
         self.conn: Optional[sqlite3.Connection] = None
+        self.codec = PayloadCodec()
 
     def connect(self) -> None:
         """Establish database connection."""
         logger.info(f"Connecting to SQLite database: {self.db_path}")
-        self.conn = sqlite3.connect(self.db_path)
+        # The connection is handed to ItemWriter's thread once the run starts;
+        # the main thread doesn't touch it again until the writer has finished.
+        # isolation_level=None disables the driver's implicit BEGIN before
+        # every DML statement; multi-statement work uses _transaction().
+        self.conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        if self.config.is_sqlite():
+            self._apply_pragmas()
         self.conn.row_factory = sqlite3.Row
         self._init_schema()
+        self._init_codec()
+
+    def _apply_pragmas(self) -> None:
+        """
+        Tune SQLite for a write-heavy workload of small transactions.
+
+        WAL lets readers (query_db.py) run alongside the scraper, and
+        synchronous=NORMAL is durable under WAL while only syncing at
+        checkpoints instead of on every commit.
+        """
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+        self.conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run the enclosed statements in one write transaction."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _tuple_cursor(self) -> sqlite3.Cursor:
+        """Return a cursor yielding plain tuples, for internal reads by index."""
+        cursor = self.conn.cursor()
+        # Skips building a sqlite3.Row per row; the connection default stays Row
+        cursor.row_factory = None
+        return cursor
 
     def close(self) -> None:
         """Close database connection."""
@@ -60,71 +263,283 @@ class Database:
 
     def _init_schema(self) -> None:
         """Initialize database schema."""
+        cursor = self._tuple_cursor()
+        with self._transaction():
+            # Main table for raw auction item payloads
+            # Schema designed for PostgreSQL compatibility:
+            # - item_id: Use VARCHAR in PostgreSQL (TEXT works in both)
+            # - raw_json: Use JSONB in PostgreSQL for indexing/querying
+            # - timestamps: Use TIMESTAMP WITH TIME ZONE in PostgreSQL
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS auction_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    item_id TEXT NOT NULL UNIQUE,
+                    raw_json TEXT NOT NULL,
+                    content_hash BLOB,
+                    scraped_at TEXT NOT NULL,
+                    zip_code TEXT NOT NULL,
+                    radius_miles INTEGER NOT NULL,
+                    category TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # raw_json holds TEXT or, once compression is enabled, zstd BLOBs;
+            # SQLite's TEXT affinity leaves BLOB values unconverted.
+
+            self._migrate_content_hash(cursor)
+
+            # Indexes for common queries
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_item_id ON auction_items(item_id)
+            """)
+            # Covering indexes: recent-item listings and category/zip grouping
+            # can be answered from the index without reading raw_json pages.
+            # They replace the narrower idx_scraped_at / idx_category.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scraped_at_cover
+                ON auction_items(scraped_at, item_id, category)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_zip_code ON auction_items(zip_code)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cat_zip ON auction_items(category, zip_code)
+            """)
+            # Covers the per-batch content_hash probe in upsert_items_batch
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_item_hash
+                ON auction_items(item_id, content_hash)
+            """)
+            cursor.execute("DROP INDEX IF EXISTS idx_scraped_at")
+            cursor.execute("DROP INDEX IF EXISTS idx_category")
+
+            # Table to track scrape runs for auditing
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TEXT NOT NULL,
+                    completed_at TEXT,
+                    zip_code TEXT NOT NULL,
+                    radius_miles INTEGER NOT NULL,
+                    test_mode INTEGER NOT NULL,
+                    items_found INTEGER DEFAULT 0,
+                    items_added INTEGER DEFAULT 0,
+                    items_updated INTEGER DEFAULT 0,
+                    errors INTEGER DEFAULT 0,
+                    status TEXT DEFAULT 'running'
+                )
+            """)
+
+            # Full-text index over item titles/descriptions; rowid = auction_items.id.
+            # Created and backfilled in this transaction, so an interrupted first
+            # connect leaves neither behind.
+            if not self._table_exists(cursor, "auction_items_fts"):
+                cursor.execute("""
+                    CREATE VIRTUAL TABLE auction_items_fts USING fts5(
+                        item_id UNINDEXED,
+                        lead,
+                        description,
+                        tokenize = 'porter unicode61'
+                    )
+                """)
+                self._backfill_search_index(cursor)
+
+            self._init_stats_tables(cursor)
+
+            # Key/value store for database-wide settings such as the zstd dictionary
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value BLOB
+                )
+            """)
+
+        logger.info("Database schema initialized")
+
+    def _init_codec(self) -> None:
+        """Load the payload codec, training a zstd dictionary if compression is enabled."""
+        codec = PayloadCodec.from_connection(self.conn, compress=self.config.compress_payloads)
+        if self.config.compress_payloads and not codec.compresses:
+            dict_data = self._train_zstd_dict()
+            if dict_data is not None:
+                codec = PayloadCodec(dict_data, compress=True)
+        self.codec = codec
+
+    def _train_zstd_dict(self) -> Optional[bytes]:
+        """Train and store a zstd dictionary from existing uncompressed payloads."""
+        _require_zstandard()
         cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT raw_json FROM auction_items
+            WHERE typeof(raw_json) = 'text'
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (ZSTD_DICT_SAMPLES,),
+        )
+        samples = [row[0].encode() for row in cursor.fetchall()]
+        if len(samples) < ZSTD_DICT_SAMPLES:
+            logger.info(
+                f"Payload compression pending: {len(samples)}/{ZSTD_DICT_SAMPLES} "
+                "samples available to train a zstd dictionary"
+            )
+            return None
+
+        dict_data = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+        cursor.execute(
+            "INSERT INTO meta (key, value) VALUES ('zstd_dict', ?)", (dict_data,)
+        )
+        logger.info(f"Trained zstd dictionary ({len(dict_data)} bytes) from {len(samples)} payloads")
+        return dict_data
+
+    @staticmethod
+    def _table_exists(cursor: sqlite3.Cursor, name: str) -> bool:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        )
+        return cursor.fetchone() is not None
+
+    def _init_stats_tables(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Create rollup tables kept in sync with auction_items by triggers.
+
+        Lets query_db stats read a few rows instead of scanning the item table.
+        NULL categories are counted under '' since NULL keys never conflict.
+        """
+        needs_backfill = not self._table_exists(cursor, "stats_counters")
 
-        # Main table for raw auction item payloads
-        # Schema designed for PostgreSQL compatibility:
-        # - item_id: Use VARCHAR in PostgreSQL (TEXT works in both)
-        # - raw_json: Use JSONB in PostgreSQL for indexing/querying
-        # - timestamps: Use TIMESTAMP WITH TIME ZONE in PostgreSQL
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS auction_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                item_id TEXT NOT NULL UNIQUE,
-                raw_json TEXT NOT NULL,
-                scraped_at TEXT NOT NULL,
-                zip_code TEXT NOT NULL,
-                radius_miles INTEGER NOT NULL,
-                category TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            CREATE TABLE IF NOT EXISTS stats_counters (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
             )
         """)
-
-        # Indexes for common queries
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_item_id ON auction_items(item_id)
+            CREATE TABLE IF NOT EXISTS stats_by_category (
+                category TEXT PRIMARY KEY,
+                cnt INTEGER NOT NULL DEFAULT 0
+            )
         """)
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_scraped_at ON auction_items(scraped_at)
+            CREATE TABLE IF NOT EXISTS stats_by_zip (
+                zip_code TEXT PRIMARY KEY,
+                cnt INTEGER NOT NULL DEFAULT 0
+            )
         """)
+
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_zip_code ON auction_items(zip_code)
+            CREATE TRIGGER IF NOT EXISTS trg_auction_items_stats_insert
+            AFTER INSERT ON auction_items
+            BEGIN
+                INSERT INTO stats_counters (key, value) VALUES ('items', 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1;
+                INSERT INTO stats_by_category (category, cnt)
+                VALUES (COALESCE(NEW.category, ''), 1)
+                ON CONFLICT(category) DO UPDATE SET cnt = cnt + 1;
+                INSERT INTO stats_by_zip (zip_code, cnt) VALUES (NEW.zip_code, 1)
+                ON CONFLICT(zip_code) DO UPDATE SET cnt = cnt + 1;
+            END
         """)
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_category ON auction_items(category)
+            CREATE TRIGGER IF NOT EXISTS trg_auction_items_stats_delete
+            AFTER DELETE ON auction_items
+            BEGIN
+                UPDATE stats_counters SET value = value - 1 WHERE key = 'items';
+                UPDATE stats_by_category SET cnt = cnt - 1
+                WHERE category = COALESCE(OLD.category, '');
+                UPDATE stats_by_zip SET cnt = cnt - 1 WHERE zip_code = OLD.zip_code;
+            END
         """)
-
-        # Table to track scrape runs for auditing
+        # Upserts can move an item to a different category or zip code
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS scrape_runs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                started_at TEXT NOT NULL,
-                completed_at TEXT,
-                zip_code TEXT NOT NULL,
-                radius_miles INTEGER NOT NULL,
-                test_mode INTEGER NOT NULL,
-                items_found INTEGER DEFAULT 0,
-                items_added INTEGER DEFAULT 0,
-                items_updated INTEGER DEFAULT 0,
-                errors INTEGER DEFAULT 0,
-                status TEXT DEFAULT 'running'
-            )
+            CREATE TRIGGER IF NOT EXISTS trg_auction_items_stats_update
+            AFTER UPDATE OF category, zip_code ON auction_items
+            WHEN OLD.category IS NOT NEW.category OR OLD.zip_code IS NOT NEW.zip_code
+            BEGIN
+                UPDATE stats_by_category SET cnt = cnt - 1
+                WHERE category = COALESCE(OLD.category, '');
+                INSERT INTO stats_by_category (category, cnt)
+                VALUES (COALESCE(NEW.category, ''), 1)
+                ON CONFLICT(category) DO UPDATE SET cnt = cnt + 1;
+                UPDATE stats_by_zip SET cnt = cnt - 1 WHERE zip_code = OLD.zip_code;
+                INSERT INTO stats_by_zip (zip_code, cnt) VALUES (NEW.zip_code, 1)
+                ON CONFLICT(zip_code) DO UPDATE SET cnt = cnt + 1;
+            END
         """)
 
-        self.conn.commit()
-        logger.info("Database schema initialized")
+        if needs_backfill:
+            cursor.execute("""
+                INSERT INTO stats_counters (key, value)
+                SELECT 'items', COUNT(*) FROM auction_items
+            """)
+            cursor.execute("""
+                INSERT INTO stats_by_category (category, cnt)
+                SELECT COALESCE(category, ''), COUNT(*) FROM auction_items
+                GROUP BY COALESCE(category, '')
+            """)
+            cursor.execute("""
+                INSERT INTO stats_by_zip (zip_code, cnt)
+                SELECT zip_code, COUNT(*) FROM auction_items GROUP BY zip_code
+            """)
+
+    def _backfill_search_index(self, cursor: sqlite3.Cursor) -> None:
+        """Index items stored before the full-text search table existed."""
+        # Runs before _init_codec; older rows may already be zstd-compressed
+        codec = PayloadCodec.from_connection(self.conn)
+        reader = self._tuple_cursor()
+        reader.execute("SELECT id, item_id, raw_json FROM auction_items")
+        # Stream rows from the reader instead of loading every payload at once
+        cursor.executemany(
+            _SQL_INSERT_SEARCH,
+            (
+                (row_id, item_id, *search_fields(codec.decode(raw)))
+                for row_id, item_id, raw in reader
+            ),
+        )
+        if cursor.rowcount > 0:
+            logger.info(f"Built full-text search index for {cursor.rowcount} items")
+
+    def _migrate_content_hash(self, cursor: sqlite3.Cursor) -> None:
+        """Add and backfill the content_hash column on databases that predate it."""
+        cursor.execute("PRAGMA table_info(auction_items)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if "content_hash" in columns:
+            return
+
+        logger.info("Migrating auction_items: adding content_hash column")
+        cursor.execute("ALTER TABLE auction_items ADD COLUMN content_hash BLOB")
+
+        # Walk the table in id order one chunk at a time, so only a chunk of
+        # payloads is held in memory and no read is open while rows are updated
+        last_id = 0
+        while True:
+            cursor.execute(
+                "SELECT id, raw_json FROM auction_items WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, MIGRATION_CHUNK_SIZE),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            # Older rows hold json.dumps() text; hash the same compact orjson form
+            # upsert_items_batch produces, so unchanged items aren't rewritten
+            cursor.executemany(
+                "UPDATE auction_items SET content_hash = ? WHERE id = ?",
+                [
+                    (content_hash(orjson.dumps(orjson.loads(raw))), row_id)
+                    for row_id, raw in rows
+                ],
+            )
+            last_id = rows[-1][0]
 
     def start_scrape_run(self, zip_code: str, radius_miles: int, test_mode: bool) -> int:
         """Record the start of a scrape run. Returns run ID."""
         cursor = self.conn.cursor()
         cursor.execute(
-            """
-            INSERT INTO scrape_runs (started_at, zip_code, radius_miles, test_mode)
-            VALUES (?, ?, ?, ?)
-            """,
+            _SQL_START_RUN,
             (datetime.now(timezone.utc).isoformat(), zip_code, radius_miles, int(test_mode)),
         )
-        self.conn.commit()
         return cursor.lastrowid
 
     def complete_scrape_run(
@@ -139,12 +554,7 @@ class Database:
         """Record the completion of a scrape run."""
         cursor = self.conn.cursor()
         cursor.execute(
-            """
-            UPDATE scrape_runs
-            SET completed_at = ?, items_found = ?, items_added = ?,
-                items_updated = ?, errors = ?, status = ?
-            WHERE id = ?
-            """,
+            _SQL_COMPLETE_RUN,
             (
                 datetime.now(timezone.utc).isoformat(),
                 items_found,
@@ -155,7 +565,6 @@ class Database:
                 run_id,
             ),
         )
-        self.conn.commit()
 
     def upsert_item(
         self,
@@ -166,55 +575,92 @@ class Database:
         category: Optional[str] = None,
     ) -> tuple[bool, bool]:
         """
-        Insert or update an auction item.
+        Insert or update a single auction item.
 
         Returns: (is_new, is_updated) tuple
         """
-        cursor = self.conn.cursor()
+        added, updated = self.upsert_items_batch(
+            [(item_id, raw_json, zip_code, radius_miles, category)]
+        )
+        return (added > 0, updated > 0)
+
+    def upsert_items_batch(
+        self, rows: list[tuple[str, dict, str, int, Optional[str]]]
+    ) -> tuple[int, int]:
+        """
+        Insert or update a batch of auction items in a single transaction.
+
+        Each row is an (item_id, raw_json, zip_code, radius_miles, category)
+        tuple. Items whose content hash matches the stored one are skipped
+        before any encoding or writing. All rows written by one batch share a
+        single scraped_at timestamp.
+        Requires SQLite 3.35+ for UPSERT ... RETURNING.
+
+        Returns: (items_added, items_updated) tuple
+        """
+        if not rows:
+            return (0, 0)
+
+        # One timestamp per batch; items in a batch are scraped seconds apart
         scraped_at = datetime.now(timezone.utc).isoformat()
-        json_str = json.dumps(raw_json)
-
-        # Check if item exists
-        cursor.execute("SELECT id, raw_json FROM auction_items WHERE item_id = ?", (item_id,))
-        existing = cursor.fetchone()
-
-        if existing:
-            # Update if JSON changed
-            if existing["raw_json"] != json_str:
-                cursor.execute(
-                    """
-                    UPDATE auction_items
-                    SET raw_json = ?, scraped_at = ?, zip_code = ?,
-                        radius_miles = ?, category = ?
-                    WHERE item_id = ?
-                    """,
-                    (json_str, scraped_at, zip_code, radius_miles, category, item_id),
-                )
-                self.conn.commit()
-                return (False, True)  # Not new, but updated
-            return (False, False)  # Not new, not updated
-        else:
-            # Insert new item
-            cursor.execute(
-                """
-                INSERT INTO auction_items
-                (item_id, raw_json, scraped_at, zip_code, radius_miles, category)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (item_id, json_str, scraped_at, zip_code, radius_miles, category),
+        candidates = {}
+        for item_id, raw_json, zip_code, radius_miles, category in rows:
+            # Later duplicates within a batch win, matching sequential upserts.
+            # Items are enriched lots assembled from the page's Apollo cache,
+            # so there is no per-item response body to store verbatim; this
+            # single dumps() produces the bytes that are hashed and stored.
+            payload = orjson.dumps(raw_json)
+            candidates[item_id] = (
+                payload, content_hash(payload), raw_json, zip_code, radius_miles, category,
             )
-            self.conn.commit()
-            return (True, False)  # New item
+
+        added = 0
+        updated = 0
+        search_deletes = []
+        search_inserts = []
+        cursor = self._tuple_cursor()
+        with self._transaction():
+            # AUTOINCREMENT ids only grow, so any id above this one is a new row
+            cursor.execute(_SQL_MAX_ITEM_ID)
+            max_existing_id = cursor.fetchone()[0]
+            cursor.execute(_SQL_SELECT_HASHES, (orjson.dumps(list(candidates)),))
+            stored_hashes = dict(cursor.fetchall())
+
+            for item_id, (
+                payload, digest, raw_json, zip_code, radius_miles, category,
+            ) in candidates.items():
+                # Unchanged since the last scrape: nothing to encode or index
+                if stored_hashes.get(item_id) == digest:
+                    continue
+
+                cursor.execute(_SQL_UPSERT_ITEM, (
+                    item_id, self.codec.encode(payload), digest, scraped_at,
+                    zip_code, radius_miles, category,
+                ))
+                row = cursor.fetchone()
+                if row is None:
+                    continue
+                if row[0] > max_existing_id:
+                    added += 1
+                else:
+                    updated += 1
+                    search_deletes.append((row[0],))
+                search_inserts.append((row[0], item_id, *search_fields(raw_json)))
+
+            cursor.executemany(_SQL_DELETE_SEARCH, search_deletes)
+            cursor.executemany(_SQL_INSERT_SEARCH, search_inserts)
+
+        return (added, updated)
 
     def get_item(self, item_id: str) -> Optional[dict]:
         """Retrieve an item by ID."""
         cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM auction_items WHERE item_id = ?", (item_id,)
-        )
+        cursor.execute(_SQL_SELECT_ITEM, (item_id,))
         row = cursor.fetchone()
         if row:
-            return dict(row)
+            item = dict(row)
+            item["raw_json"] = self.codec.decode_text(item["raw_json"])
+            return item
         return None
 
     def get_recent_items(self, limit: int = 100) -> list[dict]:
@@ -222,13 +668,17 @@ class Database:
         cursor = self.conn.cursor()
         cursor.execute(
             """
-            SELECT * FROM auction_items
+            SELECT item_id, raw_json, scraped_at, zip_code, radius_miles, category
+            FROM auction_items
             ORDER BY scraped_at DESC
             LIMIT ?
             """,
             (limit,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        items = [dict(row) for row in cursor.fetchall()]
+        for item in items:
+            item["raw_json"] = self.codec.decode_text(item["raw_json"])
+        return items
 
     def get_item_count(self) -> int:
         """Get total number of items in database."""
@@ -246,6 +696,70 @@ class Database:
         return None
 
 
+class ItemWriter(threading.Thread):
+    """
+    Background thread that drains scraped items into the database.
+
+    The scraper (network-bound) feeds rows through a bounded queue while this
+    thread writes them with upsert_items_batch (disk-bound), so neither waits
+    on the other. A batch is flushed when it reaches batch_size or the queue
+    runs dry, whichever comes first.
+    """
+
+    _SENTINEL = object()
+
+    def __init__(self, db: Database, batch_size: int = 500, queue_size: int = 1024):
+        super().__init__(name="item-writer", daemon=True)
+        self.db = db
+        self.batch_size = batch_size
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.items_added = 0
+        self.items_updated = 0
+        self.error: Optional[BaseException] = None
+
+    def put(self, row: tuple[str, dict, str, int, Optional[str]]) -> None:
+        """Queue an (item_id, raw_json, zip_code, radius_miles, category) row."""
+        if self.error is not None:
+            raise RuntimeError("Item writer failed") from self.error
+        self.queue.put(row)
+
+    def close(self) -> None:
+        """Flush queued rows and wait for the thread to exit."""
+        if self.is_alive():
+            self.queue.put(self._SENTINEL)
+            self.join()
+
+    def run(self) -> None:
+        done = False
+        while not done:
+            batch = []
+            row = self.queue.get()
+            while True:
+                if row is self._SENTINEL:
+                    done = True
+                    break
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    row = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            # After a failure keep draining so the producer never blocks on put()
+            if batch and self.error is None:
+                try:
+                    added, updated = self.db.upsert_items_batch(batch)
+                except Exception as e:
+                    logger.error(f"Failed to write batch of {len(batch)} items: {e}")
+                    self.error = e
+                    continue
+                self.items_added += added
+                self.items_updated += updated
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Wrote batch of {len(batch)} items ({added} added, {updated} updated)")
+
+
 # =============================================================================
 # POSTGRESQL IMPLEMENTATION (uncomment when ready to switch)
 # =============================================================================
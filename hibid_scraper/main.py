@@ -23,26 +23,52 @@ Examples:
 """
 
 import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+from dataclasses import replace
 from datetime import datetime, timezone
 
 from config import Config
-from database import Database
+from database import Database, ItemWriter
 from scraper import HiBidScraper
 
+# Number of scraped items written to the database per transaction
+UPSERT_BATCH_SIZE = 500
+
+# Scraped items allowed to queue up ahead of the database writer
+WRITE_QUEUE_SIZE = 1024
+
 
 def setup_logging(level: str = "INFO") -> None:
-    """Configure logging for the scraper."""
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("scraper.log", mode="a"),
-        ],
+    """
+    Configure logging for the scraper.
+
+    Records are handed to a QueueListener thread that formats them and does
+    the stdout/file I/O, so logging calls in the scrape loop only enqueue.
+    scraper.log receives warnings and errors and is opened on first use.
+    """
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    file_handler = logging.FileHandler("scraper.log", mode="a", delay=True)
+    file_handler.setLevel(logging.WARNING)
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
     )
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level.upper()))
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
 
 
 def parse_args() -> argparse.Namespace:
@@ -142,19 +168,21 @@ def main() -> int:
         config = Config(zip_code=args.zip or "00000")
 
     # Apply command line overrides
+    overrides = {}
     if args.zip:
-        config.zip_code = args.zip
+        overrides["zip_code"] = args.zip
     if args.radius:
-        config.radius_miles = args.radius
+        overrides["radius_miles"] = args.radius
     if args.test:
-        config.test_mode = True
-        config.test_limit = args.limit
+        overrides["test_mode"] = True
+        overrides["test_limit"] = args.limit
     if args.categories:
-        config.search_categories = [c.strip() for c in args.categories.split(",")]
+        overrides["search_categories"] = [c.strip() for c in args.categories.split(",")]
     if args.db:
-        config.database_url = args.db
+        overrides["database_url"] = args.db
     if args.log_level:
-        config.log_level = args.log_level
+        overrides["log_level"] = args.log_level
+    config = replace(config, **overrides)
 
     # Setup logging
     setup_logging(config.log_level)
@@ -169,6 +197,10 @@ def main() -> int:
 
     start_time = datetime.now(timezone.utc)
     run_id = None
+    writer = None
+    final_status = "completed"
+    errors_extra = 0
+    exit_code = 0
 
     try:
         # Connect to database
@@ -180,78 +212,56 @@ def main() -> int:
         )
         logger.info(f"Started scrape run #{run_id}")
 
-        # Scrape items
-        items_added = 0
-        items_updated = 0
+        # Scrape items; a background thread writes them to the database
+        writer = ItemWriter(db, batch_size=UPSERT_BATCH_SIZE, queue_size=WRITE_QUEUE_SIZE)
+        writer.start()
 
         for item_id, raw_json, category in scraper.scrape_all():
-            is_new, is_updated = db.upsert_item(
-                item_id=item_id,
-                raw_json=raw_json,
-                zip_code=config.zip_code,
-                radius_miles=config.radius_miles,
-                category=category,
+            writer.put(
+                (item_id, raw_json, config.zip_code, config.radius_miles, category)
             )
 
-            if is_new:
-                items_added += 1
-                logger.debug(f"Added new item: {item_id}")
-            elif is_updated:
-                items_updated += 1
-                logger.debug(f"Updated item: {item_id}")
-
-        # Update statistics
-        scraper_stats = scraper.get_stats()
-
-        # Complete scrape run
-        db.complete_scrape_run(
-            run_id=run_id,
-            items_found=scraper_stats.items_found,
-            items_added=items_added,
-            items_updated=items_updated,
-            errors=scraper_stats.errors,
-            status="completed",
-        )
-
-        end_time = datetime.now(timezone.utc)
-        run_stats = db.get_run_stats(run_id)
-
-        print_summary(run_id, run_stats, start_time, end_time, config)
-
-        logger.info("Scrape completed successfully")
-        return 0
+        writer.close()
+        if writer.error is not None:
+            raise writer.error
 
     except KeyboardInterrupt:
         logger.warning("Scrape interrupted by user")
-        if run_id:
-            scraper_stats = scraper.get_stats()
-            db.complete_scrape_run(
-                run_id=run_id,
-                items_found=scraper_stats.items_found,
-                items_added=0,
-                items_updated=0,
-                errors=scraper_stats.errors,
-                status="interrupted",
-            )
-        return 130
+        final_status = "interrupted"
+        exit_code = 130
 
     except Exception as e:
         logger.exception(f"Scrape failed: {e}")
-        if run_id:
+        final_status = "failed"
+        errors_extra = 1
+        exit_code = 1
+
+    finally:
+        # Single finalization point: flush pending writes, then record the run
+        if writer is not None:
+            writer.close()
+
+        if run_id is not None:
             scraper_stats = scraper.get_stats()
             db.complete_scrape_run(
                 run_id=run_id,
                 items_found=scraper_stats.items_found,
-                items_added=0,
-                items_updated=0,
-                errors=scraper_stats.errors + 1,
-                status="failed",
+                items_added=writer.items_added if writer else 0,
+                items_updated=writer.items_updated if writer else 0,
+                errors=scraper_stats.errors + errors_extra,
+                status=final_status,
             )
-        return 1
 
-    finally:
+            if final_status == "completed":
+                end_time = datetime.now(timezone.utc)
+                run_stats = db.get_run_stats(run_id)
+                print_summary(run_id, run_stats, start_time, end_time, config)
+                logger.info("Scrape completed successfully")
+
         db.close()
 
+    return exit_code
+
 
 if __name__ == "__main__":
     sys.exit(main())
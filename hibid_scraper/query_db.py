@@ -9,23 +9,21 @@ Usage:
     python query_db.py recent [N]      # Show N most recent items (default: 10)
     python query_db.py runs            # Show scrape run history
     python query_db.py item <item_id>  # Show full JSON for an item
-    python query_db.py search <term>   # Search items by text
+    python query_db.py search <term>   # Full-text search on titles/descriptions
 """
 
 import argparse
-import json
 import sqlite3
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
+import orjson
 from config import Config
-
-load_dotenv()
+from database import PayloadCodec
 
 
 def get_db_path() -> str:
-    """Get database path from config."""
+    """Get database path from the process-wide config."""
     try:
         config = Config.from_env()
         return config.get_sqlite_path()
@@ -46,43 +44,79 @@ def connect_db(db_path: str) -> sqlite3.Connection:
     return conn
 
 
+def item_counts(cursor: sqlite3.Cursor) -> tuple[int, list, list]:
+    """
+    Return (item_count, categories, zip_codes) for the stats report.
+
+    Reads the rollup tables maintained by triggers (see
+    Database._init_stats_tables). Databases the scraper hasn't opened since
+    those were added fall back to counting auction_items directly.
+    """
+    try:
+        cursor.execute("SELECT value FROM stats_counters WHERE key = 'items'")
+        row = cursor.fetchone()
+        item_count = row["value"] if row else 0
+
+        cursor.execute("""
+            SELECT category, cnt as count
+            FROM stats_by_category
+            WHERE cnt > 0
+            ORDER BY count DESC
+        """)
+        categories = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT zip_code, cnt as count
+            FROM stats_by_zip
+            WHERE cnt > 0
+            ORDER BY count DESC
+        """)
+        zip_codes = cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+
+        cursor.execute("SELECT COUNT(*) as count FROM auction_items")
+        item_count = cursor.fetchone()["count"]
+
+        cursor.execute("""
+            SELECT category, COUNT(*) as count
+            FROM auction_items
+            GROUP BY category
+            ORDER BY count DESC
+        """)
+        categories = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT zip_code, COUNT(*) as count
+            FROM auction_items
+            GROUP BY zip_code
+            ORDER BY count DESC
+        """)
+        zip_codes = cursor.fetchall()
+
+    return item_count, categories, zip_codes
+
+
 def cmd_stats(conn: sqlite3.Connection) -> None:
     """Show database statistics."""
     cursor = conn.cursor()
 
-    # Item count
-    cursor.execute("SELECT COUNT(*) as count FROM auction_items")
-    item_count = cursor.fetchone()["count"]
+    # Item count and per-category / per-zip breakdowns
+    item_count, categories, zip_codes = item_counts(cursor)
 
     # Run count
     cursor.execute("SELECT COUNT(*) as count FROM scrape_runs")
     run_count = cursor.fetchone()["count"]
 
-    # Date range
+    # Date range (separate subqueries so each is a single idx_scraped_at_cover probe)
     cursor.execute("""
-        SELECT MIN(scraped_at) as oldest, MAX(scraped_at) as newest
-        FROM auction_items
+        SELECT
+            (SELECT MIN(scraped_at) FROM auction_items) as oldest,
+            (SELECT MAX(scraped_at) FROM auction_items) as newest
     """)
     dates = cursor.fetchone()
 
-    # Categories
-    cursor.execute("""
-        SELECT category, COUNT(*) as count
-        FROM auction_items
-        GROUP BY category
-        ORDER BY count DESC
-    """)
-    categories = cursor.fetchall()
-
-    # Zip codes
-    cursor.execute("""
-        SELECT zip_code, COUNT(*) as count
-        FROM auction_items
-        GROUP BY zip_code
-        ORDER BY count DESC
-    """)
-    zip_codes = cursor.fetchall()
-
     print("\n" + "=" * 50)
     print("DATABASE STATISTICS")
     print("=" * 50)
@@ -103,6 +137,7 @@ def cmd_stats(conn: sqlite3.Connection) -> None:
 
 def cmd_recent(conn: sqlite3.Connection, limit: int = 10) -> None:
     """Show recent items."""
+    codec = PayloadCodec.from_connection(conn)
     cursor = conn.cursor()
     cursor.execute("""
         SELECT item_id, scraped_at, category, raw_json
@@ -117,7 +152,7 @@ def cmd_recent(conn: sqlite3.Connection, limit: int = 10) -> None:
     print("-" * 80)
 
     for item in items:
-        raw = json.loads(item["raw_json"])
+        raw = codec.decode(item["raw_json"])
         title = raw.get("lead", "No title")[:50]
         # Auction data is nested under auction_data from resolved references
         auction = raw.get("auction_data", {})
@@ -137,7 +172,9 @@ def cmd_runs(conn: sqlite3.Connection) -> None:
     """Show scrape run history."""
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT * FROM scrape_runs
+        SELECT id, status, zip_code, radius_miles, items_found, items_added,
+               errors, started_at
+        FROM scrape_runs
         ORDER BY started_at DESC
         LIMIT 20
     """)
@@ -164,9 +201,15 @@ def cmd_runs(conn: sqlite3.Connection) -> None:
 
 def cmd_item(conn: sqlite3.Connection, item_id: str) -> None:
     """Show full JSON for an item."""
+    codec = PayloadCodec.from_connection(conn)
     cursor = conn.cursor()
     cursor.execute(
-        "SELECT * FROM auction_items WHERE item_id = ?", (item_id,)
+        """
+        SELECT scraped_at, zip_code, radius_miles, category, raw_json
+        FROM auction_items
+        WHERE item_id = ?
+        """,
+        (item_id,),
     )
     item = cursor.fetchone()
 
@@ -180,19 +223,41 @@ def cmd_item(conn: sqlite3.Connection, item_id: str) -> None:
     print(f"Category: {item['category'] or 'all'}")
     print("-" * 50)
     print("Raw JSON:")
-    print(json.dumps(json.loads(item["raw_json"]), indent=2))
+    print(orjson.dumps(codec.decode(item["raw_json"]), option=orjson.OPT_INDENT_2).decode())
+
+
+def fts_query(term: str) -> str:
+    """
+    Build an FTS5 query matching items that contain every word as a prefix.
+
+    Words are quoted so FTS5 treats them as plain text, and prefix matching
+    keeps "vint" finding "vintage" as the old LIKE '%term%' search did.
+    """
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in term.split())
 
 
 def cmd_search(conn: sqlite3.Connection, term: str) -> None:
-    """Search items by text in JSON."""
+    """Search item titles and descriptions via the full-text index."""
+    if not term.split():
+        print("Error: search term required")
+        return
+
     cursor = conn.cursor()
-    # Search in raw_json text
-    cursor.execute("""
-        SELECT item_id, scraped_at, raw_json
-        FROM auction_items
-        WHERE raw_json LIKE ?
-        LIMIT 20
-    """, (f"%{term}%",))
+    try:
+        cursor.execute("""
+            SELECT item_id, lead
+            FROM auction_items_fts
+            WHERE auction_items_fts MATCH ?
+            ORDER BY rank
+            LIMIT 20
+        """, (fts_query(term),))
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e):
+            print(f"Error: search failed ({e})")
+            return
+        print(f"Error: search index unavailable ({e})")
+        print("Run the scraper once to build it: python main.py --test")
+        return
 
     items = cursor.fetchall()
 
@@ -200,8 +265,7 @@ def cmd_search(conn: sqlite3.Connection, term: str) -> None:
     print("-" * 80)
 
     for item in items:
-        raw = json.loads(item["raw_json"])
-        title = raw.get("lead", "No title")[:60]
+        title = (item["lead"] or "No title")[:60]
         print(f"{item['item_id']}: {title}")
 
 
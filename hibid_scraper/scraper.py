@@ -9,16 +9,20 @@ Apollo state cache in a <script id="hibid-state"> tag, which we parse
 to extract lot data.
 """
 
-import json
 import logging
-import random
 import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Iterator, Optional
+from urllib.parse import urlencode
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import Config
 
@@ -34,9 +38,26 @@ USER_AGENT = (
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
+# Per-request timeout in seconds
+REQUEST_TIMEOUT = 30
+
+# Retry policy for page fetches: connection errors and 429/5xx responses are
+# retried with exponential backoff (honoring Retry-After) before giving up
+FETCH_RETRY = Retry(
+    total=3,
+    backoff_factor=1.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+)
+
 # Items per page (HiBid's default is 100, but we use smaller batches for stability)
 ITEMS_PER_PAGE = 100
 
+# Locates the body of <script id="hibid-state"> without building a DOM
+HIBID_STATE_RE = re.compile(
+    rb'<script[^>]*\bid=["\']hibid-state["\'][^>]*>(.*?)</script>', re.DOTALL
+)
+
 
 @dataclass
 class ScrapeStats:
@@ -49,6 +70,37 @@ class ScrapeStats:
     pages_scraped: int = 0
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `rate` tokens per second.
+
+    Up to `capacity` tokens are banked while idle. A caller that finds the
+    bucket empty reserves the next token and sleeps until it is due, so
+    concurrent callers are spaced out in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, blocking until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            logger.debug(f"Rate limited, sleeping for {wait:.2f} seconds")
+            time.sleep(wait)
+
+
 class HiBidScraper:
     """Scraper for HiBid auction listings."""
 
@@ -60,75 +112,93 @@ class HiBidScraper:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
         })
+        # One host: a small pool keeps connections alive, with room for one
+        # per fetch worker. requests already advertises every Content-Encoding
+        # it can decode.
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(4, self.config.concurrency),
+                max_retries=FETCH_RETRY,
+            ),
+        )
         self.stats = ScrapeStats()
 
-    def _delay(self) -> None:
-        """Apply random delay between requests."""
-        delay = random.uniform(
-            self.config.request_delay_min, self.config.request_delay_max
-        )
-        logger.debug(f"Sleeping for {delay:.2f} seconds")
-        time.sleep(delay)
+        # Requests are paced at the mean configured delay across all fetch
+        # workers; time spent waiting on a slow response counts toward it
+        mean_delay = (self.config.request_delay_min + self.config.request_delay_max) / 2
+        self._bucket = TokenBucket(rate=1 / mean_delay) if mean_delay > 0 else None
 
-    def _build_url(self, category: Optional[str], page: int) -> str:
-        """Build HiBid search URL."""
-        # Base URL pattern for lots
-        if category:
-            url = f"{HIBID_BASE_URL}/lots/{category}/"
-        else:
-            url = f"{HIBID_BASE_URL}/lots/"
-
-        # Query parameters
-        params = {
+        # Query parameters that are the same for every page request
+        self._static_qs = urlencode({
             "status": "open",
             "zip": self.config.zip_code,
-            "miles": str(self.config.radius_miles),
-            "apage": str(page),
-            "ipp": str(ITEMS_PER_PAGE),
-        }
-
-        query_string = "&".join(f"{k}={v}" for k, v in params.items())
-        return f"{url}?{query_string}"
-
-    def _fetch_page(self, url: str, retries: int = 3) -> Optional[str]:
-        """Fetch a page with retry logic."""
-        for attempt in range(retries):
-            try:
-                logger.debug(f"Fetching: {url} (attempt {attempt + 1}/{retries})")
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                return response.text
-            except requests.RequestException as e:
-                logger.warning(f"Request failed: {e}")
-                if attempt < retries - 1:
-                    wait_time = (attempt + 1) * 5
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"All retries exhausted for {url}")
-                    self.stats.errors += 1
-                    return None
+            "miles": self.config.radius_miles,
+            "ipp": ITEMS_PER_PAGE,
+        })
+
+    def _build_url(self, category: Optional[str], page: int) -> str:
+        """Build HiBid search URL."""
+        lots_path = f"lots/{category}/" if category else "lots/"
+        return f"{HIBID_BASE_URL}/{lots_path}?apage={page}&{self._static_qs}"
+
+    def _fetch_page(self, url: str) -> Optional[bytes]:
+        """
+        Fetch a page. Transient failures are retried by the session's adapter.
+
+        Waits for the shared rate limit first. May run on a prefetch thread,
+        so failures are reported by returning None and counted by the caller
+        rather than here.
+        """
+        if self._bucket is not None:
+            self._bucket.acquire()
+        try:
+            logger.debug(f"Fetching: {url}")
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return response.content
+        except requests.RequestException as e:
+            logger.error(f"Request failed for {url}: {e}")
+            return None
+
+    def _find_state_script(self, html: bytes) -> Optional[bytes]:
+        """
+        Return the raw contents of the hibid-state script tag.
+
+        A regex handles the expected markup in one pass; if it misses (e.g.
+        unusual attribute quoting), fall back to parsing with lxml.
+        """
+        match = HIBID_STATE_RE.search(html)
+        if match:
+            return match.group(1)
+
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        logger.debug("hibid-state regex missed, falling back to HTML parser")
+        strainer = SoupStrainer("script", attrs={"id": "hibid-state"})
+        soup = BeautifulSoup(html, "lxml", parse_only=strainer)
+        state_script = soup.find("script", {"id": "hibid-state"})
+        if state_script and state_script.string:
+            return state_script.string.encode()
         return None
 
-    def _extract_apollo_state(self, html: str) -> Optional[dict]:
+    def _extract_apollo_state(self, html: bytes) -> Optional[dict]:
         """
         Extract Apollo GraphQL state from HiBid's SSR response.
 
         HiBid embeds the Apollo cache in <script id="hibid-state">.
         """
         try:
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Find the hibid-state script tag
-            state_script = soup.find("script", {"id": "hibid-state"})
-            if not state_script or not state_script.string:
+            state_script = self._find_state_script(html)
+            if not state_script or not state_script.strip():
                 logger.warning("No hibid-state script found in response")
                 return None
 
-            state_data = json.loads(state_script.string)
+            state_data = orjson.loads(state_script)
             return state_data.get("apollo.state", {})
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse Apollo state JSON: {e}")
             self.stats.errors += 1
             return None
@@ -137,55 +207,62 @@ class HiBidScraper:
             self.stats.errors += 1
             return None
 
-    def _extract_lots_from_apollo(self, apollo_state: dict) -> list[dict]:
+    def _extract_lots_from_apollo(
+        self, apollo_state: dict
+    ) -> Iterator[tuple[dict, Optional[dict], Optional[dict]]]:
         """
         Extract lot objects from Apollo state.
 
         Lots are stored with keys like "Lot:12345" and have __typename="Lot".
         We also resolve references to auctions to get complete data.
+
+        Yields (lot, auction, lot_state) tuples. The lot is the cache entry
+        itself (not a copy); auction and lot_state are the resolved referenced
+        entries, or None. Auctions are indexed up front; lot references are
+        resolved lazily as the caller consumes them.
         """
-        lots = []
         auctions = {}
+        pending_lots = []
 
-        # First pass: collect auctions
+        # Single pass: index auctions and collect lots; Apollo cache keys are
+        # already normalized as "Typename:id", so each entry is stored once
         for key, value in apollo_state.items():
-            if isinstance(value, dict):
-                if value.get("__typename") == "Auction" or key.startswith("Auction:"):
-                    auction_id = key.replace("Auction:", "") if key.startswith("Auction:") else value.get("id")
-                    auctions[key] = value
-                    auctions[f"Auction:{auction_id}"] = value
-
-        # Second pass: collect lots and resolve auction references
-        for key, value in apollo_state.items():
-            if isinstance(value, dict) and (
-                value.get("__typename") == "Lot" or key.startswith("Lot:")
-            ):
-                lot = dict(value)  # Make a copy
-
-                # Resolve auction reference
-                auction_ref = lot.get("auction", {})
-                if isinstance(auction_ref, dict) and "__ref" in auction_ref:
-                    ref_key = auction_ref["__ref"]
-                    if ref_key in auctions:
-                        lot["_resolved_auction"] = auctions[ref_key]
-
-                # Also resolve lotState reference if present
-                lot_state_ref = lot.get("lotState", {})
-                if isinstance(lot_state_ref, dict) and "__ref" in lot_state_ref:
-                    ref_key = lot_state_ref["__ref"]
-                    if ref_key in apollo_state:
-                        lot["_resolved_lotState"] = apollo_state[ref_key]
-
-                lots.append(lot)
-
-        return lots
+            # orjson only produces plain dicts, so an exact class check suffices
+            if value.__class__ is not dict:
+                continue
+            typename = value.get("__typename")
+            if typename != "Auction" and typename != "Lot":
+                # Not typed as either: fall back to the "Typename:id" key prefix
+                prefix, sep, _ = key.partition(":")
+                typename = prefix if sep else None
+            if typename == "Auction":
+                auctions[key] = value
+            elif typename == "Lot":
+                pending_lots.append(value)
+
+        # Resolve auction and lotState references now that all auctions are known
+        for lot in pending_lots:
+            auction = None
+            lot_state = None
+
+            # Resolve auction reference
+            auction_ref = lot.get("auction")
+            if auction_ref.__class__ is dict and "__ref" in auction_ref:
+                auction = auctions.get(auction_ref["__ref"])
+
+            # Also resolve lotState reference if present
+            lot_state_ref = lot.get("lotState")
+            if lot_state_ref.__class__ is dict and "__ref" in lot_state_ref:
+                lot_state = apollo_state.get(lot_state_ref["__ref"])
+
+            yield (lot, auction, lot_state)
 
     def _get_item_id(self, item: dict) -> Optional[str]:
         """Extract unique item ID from lot data."""
         # Try various ID fields
-        for field in ["id", "itemId", "eventItemId"]:
-            if field in item and item[field]:
-                return str(item[field])
+        item_id = item.get("id") or item.get("itemId") or item.get("eventItemId")
+        if item_id:
+            return str(item_id)
 
         # Fallback: use Apollo cache key pattern
         typename = item.get("__typename", "")
@@ -194,33 +271,41 @@ class HiBidScraper:
 
         return None
 
-    def _enrich_lot_data(self, lot: dict) -> dict:
+    def _enrich_lot_data(
+        self, lot: dict, auction: Optional[dict], lot_state: Optional[dict]
+    ) -> dict:
         """
         Enrich lot data with resolved references for complete raw payload.
 
         This ensures we store all available data including auction details.
+        The lot is copied exactly once; the Apollo cache entry is not modified.
         """
         enriched = dict(lot)
 
-        # Add resolved auction data inline if present
-        if "_resolved_auction" in enriched:
-            auction = enriched.pop("_resolved_auction")
-            enriched["auction_data"] = auction
-
-        # Add resolved lot state inline if present
-        if "_resolved_lotState" in enriched:
-            lot_state = enriched.pop("_resolved_lotState")
-            enriched["lot_state_data"] = lot_state
-
         # Clean up internal Apollo fields for storage
         # Keep __typename as it's useful for understanding the data
-        if "auction" in enriched and isinstance(enriched["auction"], dict):
-            if "__ref" in enriched["auction"]:
-                enriched["auction_ref"] = enriched.pop("auction")["__ref"]
+        auction_ref = None
+        ref = enriched.get("auction")
+        if ref.__class__ is dict and "__ref" in ref:
+            del enriched["auction"]
+            auction_ref = ref["__ref"]
+
+        lot_state_ref = None
+        ref = enriched.get("lotState")
+        if ref.__class__ is dict and "__ref" in ref:
+            del enriched["lotState"]
+            lot_state_ref = ref["__ref"]
+
+        # Add resolved auction / lot state data inline if present
+        if auction is not None:
+            enriched["auction_data"] = auction
+        if lot_state is not None:
+            enriched["lot_state_data"] = lot_state
 
-        if "lotState" in enriched and isinstance(enriched["lotState"], dict):
-            if "__ref" in enriched["lotState"]:
-                enriched["lot_state_ref"] = enriched.pop("lotState")["__ref"]
+        if auction_ref is not None:
+            enriched["auction_ref"] = auction_ref
+        if lot_state_ref is not None:
+            enriched["lot_state_ref"] = lot_state_ref
 
         return enriched
 
@@ -229,6 +314,12 @@ class HiBidScraper:
         Scrape all items from a category.
 
         Yields: (item_id, raw_json) tuples
+
+        Upcoming pages are fetched on background threads (subject to the
+        shared rate limit) while the current page's items are being yielded,
+        so network round trips overlap with downstream processing. Up to
+        config.concurrency pages are in flight at once; results are still
+        processed in page order.
         """
         page = 1
         total_items = 0
@@ -240,58 +331,79 @@ class HiBidScraper:
             f"(zip: {self.config.zip_code}, radius: {self.config.radius_miles} miles)"
         )
 
-        while total_items < test_limit:
-            url = self._build_url(category, page)
-            html = self._fetch_page(url)
-
-            if not html:
-                logger.warning(f"Failed to fetch page {page}")
-                break
-
-            apollo_state = self._extract_apollo_state(html)
-            if not apollo_state:
-                logger.warning(f"No Apollo state on page {page}")
-                break
-
-            lots = self._extract_lots_from_apollo(apollo_state)
-            self.stats.pages_scraped += 1
-
-            # Filter out lots we've already seen (duplicates across pages)
-            new_lots = []
-            for lot in lots:
-                item_id = self._get_item_id(lot)
-                if item_id and item_id not in seen_ids:
-                    seen_ids.add(item_id)
-                    new_lots.append(lot)
-
-            if not new_lots:
-                logger.info(f"No new items found on page {page}")
-                break
-
-            logger.info(f"Page {page}: found {len(new_lots)} new items (total lots in state: {len(lots)})")
-
-            for lot in new_lots:
-                if total_items >= test_limit:
-                    logger.info(f"Test mode limit reached ({test_limit} items)")
-                    return
+        if total_items >= test_limit:
+            # A test limit of zero (or less) never needs a page
+            return
+
+        # Pages in flight; don't fetch further ahead than the test limit needs
+        window = max(1, self.config.concurrency)
+        if self.config.test_mode:
+            window = min(window, -(-self.config.test_limit // ITEMS_PER_PAGE))
+        prefetch = ThreadPoolExecutor(max_workers=window, thread_name_prefix="hibid-fetch")
+        pending: deque[Future] = deque()
+        for ahead in range(window):
+            pending.append(prefetch.submit(
+                self._fetch_page, self._build_url(category, page + ahead)
+            ))
+        try:
+            while pending and total_items < test_limit:
+                html = pending.popleft().result()
 
-                item_id = self._get_item_id(lot)
-                if item_id:
-                    enriched_lot = self._enrich_lot_data(lot)
+                if html is None:
+                    self.stats.errors += 1
+                if not html:
+                    logger.warning(f"Failed to fetch page {page}")
+                    break
+
+                apollo_state = self._extract_apollo_state(html)
+                if not apollo_state:
+                    logger.warning(f"No Apollo state on page {page}")
+                    break
+
+                self.stats.pages_scraped += 1
+
+                # Filter out lots we've already seen (duplicates across pages)
+                new_lots = []
+                lot_count = 0
+                for lot, auction, lot_state in self._extract_lots_from_apollo(apollo_state):
+                    lot_count += 1
+                    item_id = self._get_item_id(lot)
+                    if item_id and item_id not in seen_ids:
+                        seen_ids.add(item_id)
+                        new_lots.append((item_id, lot, auction, lot_state))
+
+                if not new_lots:
+                    logger.info(f"No new items found on page {page}")
+                    break
+
+                logger.info(f"Page {page}: found {len(new_lots)} new items (total lots in state: {lot_count})")
+
+                # Check if we got fewer lots than expected (end of results)
+                last_page = lot_count < ITEMS_PER_PAGE // 2
+                if last_page:
+                    logger.info("Partial page received, likely end of results")
+                elif total_items + len(new_lots) < test_limit:
+                    # More pages to come: keep the window full
+                    pending.append(prefetch.submit(
+                        self._fetch_page, self._build_url(category, page + window)
+                    ))
+
+                for item_id, lot, auction, lot_state in new_lots:
+                    if total_items >= test_limit:
+                        logger.info(f"Test mode limit reached ({test_limit} items)")
+                        return
+
+                    enriched_lot = self._enrich_lot_data(lot, auction, lot_state)
                     total_items += 1
                     self.stats.items_found += 1
                     yield (item_id, enriched_lot)
-                else:
-                    logger.warning("Lot without ID, skipping")
-                    self.stats.errors += 1
 
-            # Check if we got fewer lots than expected (end of results)
-            if len(lots) < ITEMS_PER_PAGE // 2:
-                logger.info("Partial page received, likely end of results")
-                break
-
-            page += 1
-            self._delay()
+                if last_page:
+                    break
+                page += 1
+        finally:
+            # Don't block on in-flight prefetches if we stopped early
+            prefetch.shutdown(wait=False, cancel_futures=True)
 
     def scrape_all(self) -> Iterator[tuple[str, dict, Optional[str]]]:
         """
@@ -311,10 +423,6 @@ class HiBidScraper:
                 logger.info("Test mode: stopping after reaching limit")
                 break
 
-            # Delay between categories
-            if category != categories[-1]:
-                self._delay()
-
     def get_stats(self) -> ScrapeStats:
         """Get current scraping statistics."""
         return self.stats